@@ -0,0 +1,450 @@
+"""
+Keystroke-replay latency harness for the live WordLite editor.
+
+Opens a real WordLite window (starting Xvfb when there is no display),
+fills it with a generated, heavily formatted document, replays a script of
+keystrokes and formatting actions and measures each one from the moment it
+is dispatched until Tk is idle again (after_idle), i.e. after the redraw.
+
+    python latency_harness.py
+    python latency_harness.py --paragraphs 5000 --script my_script.json
+    python latency_harness.py --budget key:p95=16 --budget "*:p99=120"
+
+A script file is either a list of events or {"events": [...], "budgets": {...}}.
+Events:
+    {"type": "type", "text": "hello"}              one "key" sample per char
+    {"type": "key", "keysym": "BackSpace", "repeat": 5}
+    {"type": "select", "start": "insert-5c", "end": "insert"}
+    {"type": "format", "action": "bold"}           bold/italic/underline/font/color/
+                                                   h1/h2/align_*/bullets/indent/outdent
+    {"type": "goto", "index": "end-1c"}            moves the cursor and scrolls
+    {"type": "resize", "width": 900}               waits for the toolbar relayout
+Budgets map an event kind (or "*") to percentile limits in ms:
+    {"key": {"p95": 16, "p99": 33}, "*": {"p99": 150}}
+
+Exits with status 1 when any budget is exceeded or cannot be checked
+(unknown kind/percentile, no samples, relayout timeouts), and with status 2
+when the replay itself fails or exceeds --timeout.
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import shutil
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+PERCENTILES = (50, 95, 99)
+BUDGET_KEYS = tuple(f"p{pct}" for pct in PERCENTILES) + ("max",)
+
+FORMAT_ACTIONS = {
+    "bold", "italic", "underline", "font", "color", "h1", "h2",
+    "align_left", "align_center", "align_right", "bullets", "indent", "outdent",
+}
+
+# how long a resize may take before its debounced toolbar relayout counts as missing
+RELAYOUT_TIMEOUT_S = 1.0
+
+DEFAULT_BUDGETS = {
+    "key": {"p95": 16, "p99": 33},
+    "*": {"p99": 150},
+}
+
+DEFAULT_EVENTS = [
+    {"type": "goto", "index": "@mid"},
+    {"type": "type", "text": "The quick brown fox jumps over the lazy dog. "},
+    {"type": "select", "start": "insert-10c", "end": "insert-5c"},
+    {"type": "format", "action": "bold"},
+    {"type": "format", "action": "italic"},
+    {"type": "goto", "index": "insert lineend"},
+    {"type": "type", "text": "Typing after formatting, with many tags around. "},
+    {"type": "key", "keysym": "BackSpace", "repeat": 10},
+    {"type": "key", "keysym": "Return"},
+    {"type": "type", "text": "A fresh paragraph in the middle of the document."},
+    {"type": "select", "start": "insert linestart", "end": "insert lineend"},
+    {"type": "format", "action": "h2"},
+    {"type": "format", "action": "align_center"},
+    {"type": "format", "action": "indent"},
+    {"type": "format", "action": "bullets"},
+    {"type": "format", "action": "color"},
+    {"type": "format", "action": "font"},
+    {"type": "goto", "index": "end-1c"},
+    {"type": "type", "text": "Closing line at the very end of a long document."},
+    {"type": "goto", "index": "1.0"},
+    {"type": "type", "text": "Opening words. "},
+    {"type": "resize", "width": 820},
+    {"type": "resize", "width": 1280},
+]
+
+KEYSYMS = {
+    " ": "space", "\n": "Return", "\t": "Tab",
+    ".": "period", ",": "comma", ";": "semicolon", ":": "colon",
+    "!": "exclam", "?": "question", "'": "apostrophe", '"': "quotedbl",
+    "-": "minus", "(": "parenleft", ")": "parenright", "/": "slash",
+    "&": "ampersand", "@": "at", "#": "numbersign", "$": "dollar",
+    "%": "percent", "^": "asciicircum", "*": "asterisk", "+": "plus",
+    "=": "equal", "_": "underscore", "[": "bracketleft", "]": "bracketright",
+    "{": "braceleft", "}": "braceright", "<": "less", ">": "greater",
+    "\\": "backslash", "|": "bar", "~": "asciitilde", "`": "grave",
+}
+
+
+def keystroke(ch):
+    """A step that types ch: a real KeyPress where X has a keysym, else Text's own insert path."""
+    if ch in KEYSYMS:
+        return ("key", KEYSYMS[ch])
+    if ch.isascii() and ch.isalnum():
+        return ("key", ch)
+    # non-ASCII (é, “, emoji…): same code the Text class binding runs for a KeyPress
+    return ("char", ch)
+
+
+WORDS = (
+    "chapter letter morning garden window river silence story evening "
+    "promise journey winter light shadow voice memory harbor quiet table "
+    "the a of and to in was she he it that with for on at by"
+).split()
+
+
+def ensure_display():
+    """Returns an Xvfb process when one had to be started, else None."""
+    if os.name == "nt" or sys.platform == "darwin" or os.environ.get("DISPLAY"):
+        return None
+
+    xvfb = shutil.which("Xvfb")
+    if not xvfb:
+        sys.exit("No DISPLAY and Xvfb is not installed (apt install xvfb).")
+
+    for n in range(99, 120):
+        if os.path.exists(f"/tmp/.X11-unix/X{n}") or os.path.exists(f"/tmp/.X{n}-lock"):
+            continue
+        proc = subprocess.Popen(
+            [xvfb, f":{n}", "-screen", "0", "1600x1000x24", "-nolisten", "tcp"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        for _ in range(100):
+            if os.path.exists(f"/tmp/.X11-unix/X{n}"):
+                os.environ["DISPLAY"] = f":{n}"
+                return proc
+            if proc.poll() is not None:
+                break
+            time.sleep(0.05)
+        proc.kill()
+    sys.exit("Could not start Xvfb.")
+
+
+def generate_document(app, paragraphs, seed=0):
+    """Fills the editor with text and a dense mix of the editor's own formatting tags."""
+    rng = random.Random(seed)
+    lines = []
+    for i in range(paragraphs):
+        if i and i % 40 == 0:
+            lines.append("<<PAGE_BREAK>>")
+        words = [rng.choice(WORDS) for _ in range(rng.randint(12, 60))]
+        lines.append(" ".join(words).capitalize() + ".")
+    app.text.insert("1.0", "\n".join(lines))
+
+    colors = ("#c00000", "#1f4e79", "#548235", "#7030a0")
+    for ln in range(1, len(lines) + 1):
+        start = f"{ln}.0"
+        if ln % 25 == 1:
+            app.text.tag_add("h1" if ln % 50 == 1 else "h2", start, f"{start} lineend")
+            continue
+        if ln % 3 == 0:
+            app._apply_composite_font(f"{start}+4c", f"{start}+24c", toggle="bold")
+        if ln % 4 == 0:
+            app._apply_composite_font(f"{start}+30c", f"{start}+50c", toggle="italic")
+        if ln % 5 == 0:
+            app.text.tag_add(app._color_tag(colors[ln % len(colors)]), f"{start}+10c", f"{start}+40c")
+        if ln % 7 == 0:
+            app._configure_indent_tag(ln % 4)
+            app.text.tag_add(app._indent_tag_for_level(ln % 4), start, f"{start} lineend+1c")
+        if ln % 11 == 0:
+            app.text.tag_add("comment", f"{start}+2c", f"{start}+18c")
+    app.text.mark_set("insert", "1.0")
+    app.text.edit_reset()
+
+
+def load_script(path):
+    """Returns (events, budgets); budgets is None when the script does not set any."""
+    if not path:
+        return DEFAULT_EVENTS, None
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        return data, None
+    if not isinstance(data, dict) or not isinstance(data.get("events"), list):
+        raise ValueError('expected a list of events or {"events": [...], "budgets": {...}}')
+    return data["events"], data.get("budgets")
+
+
+def parse_budget(spec):
+    # "key:p95=16"
+    try:
+        kind, rest = spec.rsplit(":", 1)
+        pct, ms = rest.split("=")
+        ms = float(ms)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected KIND:pNN=MS, got {spec!r}")
+    if pct not in BUDGET_KEYS:
+        raise argparse.ArgumentTypeError(f"unknown percentile {pct!r}, use one of {', '.join(BUDGET_KEYS)}")
+    return kind, pct, ms
+
+
+def expand(events):
+    """Turns script events into (kind, action) steps; actions take the app."""
+    steps = []
+    for ev in events:
+        t = ev["type"]
+        if t == "type":
+            for ch in ev["text"]:
+                steps.append(("key", keystroke(ch)))
+        elif t == "key":
+            for _ in range(ev.get("repeat", 1)):
+                steps.append(("key", ("key", ev["keysym"])))
+        elif t == "select":
+            steps.append(("select", ("select", ev["start"], ev["end"])))
+        elif t == "format":
+            if ev["action"] not in FORMAT_ACTIONS:
+                raise ValueError(f"unknown format action {ev['action']!r}")
+            steps.append((f"format:{ev['action']}", ("format", ev["action"])))
+        elif t == "goto":
+            steps.append(("goto", ("goto", ev["index"])))
+        elif t == "resize":
+            steps.append(("relayout", ("resize", ev["width"], ev.get("height", 800))))
+        else:
+            raise ValueError(f"unknown event type {t!r}")
+    return steps
+
+
+def dispatch(app, step):
+    op = step[0]
+    if op == "key":
+        app.text.event_generate("<KeyPress>", keysym=step[1])
+    elif op == "char":
+        app.text.tk.call("tk::TextInsert", app.text._w, step[1])
+    elif op == "select":
+        start, end = app.text.index(step[1]), app.text.index(step[2])
+        app.text.tag_remove("sel", "1.0", "end")
+        app.text.tag_add("sel", start, end)
+    elif op == "goto":
+        index = step[1]
+        if index == "@mid":
+            index = f"{int(app.text.index('end').split('.')[0]) // 2}.0"
+        app.text.mark_set("insert", index)
+        app.text.see("insert")
+    elif op == "resize":
+        app.geometry(f"{step[1]}x{step[2]}")
+    elif op == "format":
+        action = step[1]
+        if action in ("bold", "italic", "underline"):
+            getattr(app, f"toggle_{action}")()
+        elif action == "font":
+            app.size_var.set(14 if int(app.size_var.get()) != 14 else 12)
+            app.apply_font_to_selection()
+        elif action == "color":
+            sel = app.selection()
+            if sel:
+                app.text.tag_add(app._color_tag("#c00000"), *sel)
+        elif action in ("h1", "h2"):
+            app.apply_heading(int(action[1]))
+        elif action.startswith("align_"):
+            app.apply_alignment(action.split("_", 1)[1])
+        elif action == "bullets":
+            app.toggle_bullets()
+        elif action in ("indent", "outdent"):
+            app.change_indent(+1 if action == "indent" else -1)
+        else:
+            raise ValueError(f"unknown format action {action!r}")
+
+
+def run(app, steps, gap_ms, warmup, timeout_s):
+    """
+    Replays steps inside the app's mainloop.
+    Returns ({kind: [ms, ...]}, {kind: timeouts}, error message or None).
+    """
+    samples = {}
+    timeouts = {}
+    state = {"i": 0, "error": None}
+
+    def guarded(fn):
+        # Tk only prints exceptions raised in after() callbacks and keeps looping,
+        # which would leave the replay hanging with nothing scheduled
+        def wrapper(*args):
+            try:
+                fn(*args)
+            except Exception as e:
+                state["error"] = f"event {state['i']} {steps[state['i'] - 1][1]!r}: {e}"
+                app.quit()
+        return wrapper
+
+    @guarded
+    def record(kind, t0):
+        ms = (time.perf_counter() - t0) * 1000.0
+        if state["i"] > warmup:
+            samples.setdefault(kind, []).append(ms)
+        app.after(gap_ms, step)
+
+    @guarded
+    def wait_relayout(kind, t0, seen_job, deadline):
+        # the toolbar relayout is debounced; the writer waits for the debounce too
+        job = app._tb_relayout_job
+        if job is not None:
+            seen_job = True
+        if seen_job and job is None:
+            app.after_idle(record, kind, t0)
+        elif time.perf_counter() > deadline:
+            # no relayout happened (same width, WM ignored the geometry): not a latency sample
+            timeouts[kind] = timeouts.get(kind, 0) + 1
+            app.after(gap_ms, step)
+        else:
+            app.after(2, wait_relayout, kind, t0, seen_job, deadline)
+
+    @guarded
+    def step():
+        if state["i"] >= len(steps):
+            app.quit()
+            return
+        kind, action = steps[state["i"]]
+        state["i"] += 1
+        t0 = time.perf_counter()
+        dispatch(app, action)
+        if kind == "relayout":
+            app.after(1, wait_relayout, kind, t0, False, t0 + RELAYOUT_TIMEOUT_S)
+        else:
+            app.after_idle(record, kind, t0)
+
+    def watchdog():
+        state["error"] = f"replay did not finish within {timeout_s:g} s (at event {state['i']} of {len(steps)})"
+        app.quit()
+
+    app.after(200, step)
+    app.after(int(timeout_s * 1000), watchdog)
+    app.mainloop()
+    return samples, timeouts, state["error"]
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(samples):
+    report = {}
+    for kind, values in sorted(samples.items()):
+        row = {"n": len(values), "max": max(values)}
+        for pct in PERCENTILES:
+            row[f"p{pct}"] = percentile(values, pct)
+        report[kind] = row
+    return report
+
+
+def check_budgets(report, budgets, timeouts=None):
+    """Every budget must be checkable; one that matches nothing is a failure, not a pass."""
+    failures = []
+    if not report:
+        failures.append("no samples recorded (is --warmup larger than the script?)")
+
+    for kind, limits in sorted(budgets.items()):
+        if kind != "*" and kind not in report:
+            failures.append(f"budget for {kind!r} but no such events (have: {', '.join(report) or 'none'})")
+        for pct in limits:
+            if pct not in BUDGET_KEYS:
+                failures.append(f"budget {kind}:{pct} uses an unknown percentile")
+
+    for kind, row in report.items():
+        limits = dict(budgets.get("*", {}))
+        limits.update(budgets.get(kind, {}))
+        for pct, limit in sorted(limits.items()):
+            if pct in row and row[pct] > limit:
+                failures.append(f"{kind} {pct} {row[pct]:.1f} ms > {limit:g} ms")
+
+    for kind, count in sorted((timeouts or {}).items()):
+        failures.append(f"{kind}: {count} event(s) timed out after {RELAYOUT_TIMEOUT_S:g} s")
+    return failures
+
+
+def print_report(report):
+    print(f"{'event':<20}{'n':>6}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}   (ms)")
+    for kind, row in report.items():
+        print(
+            f"{kind:<20}{row['n']:>6}"
+            f"{row['p50']:>9.2f}{row['p95']:>9.2f}{row['p99']:>9.2f}{row['max']:>9.2f}"
+        )
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Replay keystrokes against WordLite and report input latency.")
+    ap.add_argument("--script", help="JSON event script (default: built-in script)")
+    ap.add_argument("--paragraphs", type=int, default=2000, help="size of the generated document")
+    ap.add_argument("--repeat", type=int, default=3, help="replay the script this many times")
+    ap.add_argument("--warmup", type=int, default=10, help="number of leading events left out of the stats")
+    ap.add_argument("--gap", type=int, default=5, help="ms between events (think time)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--budget", action="append", type=parse_budget, default=[],
+                    help="override a budget, e.g. key:p95=16 or '*:p99=100'")
+    ap.add_argument("--timeout", type=float, default=600, help="give up (exit 2) after this many seconds")
+    ap.add_argument("--json", help="also write the report to this file")
+    args = ap.parse_args(argv)
+
+    try:
+        events, budgets = load_script(args.script)
+        steps = expand(events) * args.repeat
+    except (OSError, KeyError, TypeError, ValueError) as e:
+        print(f"Bad script: {e}")
+        return 2
+    if budgets is None:
+        # defaults only cover the kinds this script produces; explicit budgets must all match
+        kinds = {kind for kind, _ in steps}
+        budgets = {kind: limits for kind, limits in DEFAULT_BUDGETS.items() if kind == "*" or kind in kinds}
+    budgets = {kind: dict(limits) for kind, limits in budgets.items()}
+    for kind, pct, ms in args.budget:
+        budgets.setdefault(kind, {})[pct] = ms
+
+    xvfb = ensure_display()
+    try:
+        import wordlite
+
+        app = wordlite.WordLite()
+        app.update()
+        generate_document(app, args.paragraphs, seed=args.seed)
+        app.text.focus_force()
+        app.update()
+
+        samples, timeouts, error = run(app, steps, args.gap, args.warmup, args.timeout)
+        app.destroy()
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+
+    if error:
+        print(f"Replay failed: {error}")
+        return 2
+
+    report = summarize(samples)
+    print(f"document: {args.paragraphs} paragraphs, script replayed {args.repeat}x")
+    print_report(report)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"report": report, "timeouts": timeouts, "budgets": budgets}, f, indent=2)
+
+    failures = check_budgets(report, budgets, timeouts)
+    if failures:
+        print("\nLatency budgets failed:")
+        for line in failures:
+            print(f"  {line}")
+        return 1
+    print("\nAll latency budgets met.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
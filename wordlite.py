@@ -1,12 +1,18 @@
 import json
 import os
+import queue
+import re
+import sqlite3
+import threading
 import tkinter as tk
 from tkinter import ttk, filedialog, simpledialog, messagebox, colorchooser
 import tkinter.font as tkfont
+from collections import deque
 from dataclasses import dataclass, asdict
 from datetime import datetime
 import webbrowser
 import html as htmlmod
+from html.parser import HTMLParser
 
 APP_TITLE = "OwnYourWords with No-Subscription"
 DEFAULT_FONT = "Segoe UI"
@@ -17,6 +23,18 @@ MAX_INDENT_LEVEL = 12
 
 PAGE_BREAK_TOKEN = "<<PAGE_BREAK>>"
 
+# large pastes are inserted in chunks so the window keeps handling events
+PASTE_CHUNK_CHARS = 32_000
+PASTE_CHUNK_DELAY_MS = 1
+PASTE_HTML_SLICE = 16_000
+PASTE_TAB_SPACES = 4
+
+DOC_SUFFIX = ".wordlite.json"
+LIBRARY_INDEX_NAME = ".wordlite_index.sqlite3"
+LIBRARY_MAX_HITS = 200
+# FTS rowid = (file id << LINE_BITS) | line number
+LIBRARY_LINE_BITS = 20
+
 
 @dataclass
 class Comment:
@@ -27,6 +45,298 @@ class Comment:
     created_at: str
 
 
+def normalize_paste_text(text: str) -> str:
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    text = text.replace("\u2028", "\n").replace("\u2029", "\n").replace("\x00", "")
+    return text.replace("\t", " " * PASTE_TAB_SPACES)
+
+
+def _css_color(value: str):
+    value = value.strip().lower()
+    m = re.fullmatch(r"#([0-9a-f]{3}|[0-9a-f]{6})", value)
+    if m:
+        h = m.group(1)
+        if len(h) == 3:
+            h = "".join(c * 2 for c in h)
+        return "#" + h
+    m = re.fullmatch(r"rgba?\(\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)\s*(?:,[^)]*)?\)", value)
+    if m:
+        return "#" + "".join(f"{min(255, int(c)):02x}" for c in m.groups())
+    return None
+
+
+class ClipboardHTMLParser(HTMLParser):
+    """
+    Flattens clipboard HTML into (text, style) runs.
+    Only what WordLite can show is kept: bold/italic/underline, text color,
+    h1/h2, list bullets and table cell breaks. Everything else becomes plain text.
+    Input can be fed in slices; take_runs() hands over what is parsed so far.
+    """
+
+    BLOCK_TAGS = {
+        "p", "div", "li", "ul", "ol", "h1", "h2", "h3", "h4", "h5", "h6",
+        "tr", "table", "blockquote", "pre", "section", "article", "header", "footer",
+    }
+    SKIP_TAGS = {"script", "style", "head", "title"}
+    VOID_TAGS = {"br", "img", "hr", "meta", "link", "input", "col", "wbr"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.runs = []
+        self._open = []
+        self._styles = [{"bold": False, "italic": False, "underline": False, "color": None, "heading": None}]
+        self._skip = 0
+        self._pre = 0
+        self._cells = 0
+        self._last_char = "\n"
+
+    def _emit(self, text):
+        if not text:
+            return
+        style = dict(self._styles[-1])
+        if self.runs and self.runs[-1][1] == style:
+            self.runs[-1][0] += text
+        else:
+            self.runs.append([text, style])
+        self._last_char = text[-1]
+
+    def _newline(self):
+        if self._last_char != "\n":
+            self._emit("\n")
+
+    def _style_for(self, tag, attrs):
+        style = dict(self._styles[-1])
+        if tag in ("b", "strong"):
+            style["bold"] = True
+        elif tag in ("i", "em"):
+            style["italic"] = True
+        elif tag in ("u", "ins"):
+            style["underline"] = True
+        elif tag in ("h1", "h2"):
+            style["heading"] = tag
+        elif tag in ("h3", "h4", "h5", "h6"):
+            style["bold"] = True
+
+        css = {}
+        for part in (attrs.get("style") or "").split(";"):
+            if ":" in part:
+                k, v = part.split(":", 1)
+                css[k.strip().lower()] = v.strip().lower()
+
+        weight = css.get("font-weight")
+        if weight:
+            style["bold"] = weight in ("bold", "bolder") or (weight.isdigit() and int(weight) >= 600)
+        if "font-style" in css:
+            style["italic"] = css["font-style"] in ("italic", "oblique")
+        deco = css.get("text-decoration-line", css.get("text-decoration"))
+        if deco is not None:
+            style["underline"] = "underline" in deco
+
+        color = _css_color(css.get("color", attrs.get("color") or ""))
+        if color:
+            style["color"] = None if color == "#000000" else color
+        return style
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag in self.SKIP_TAGS:
+            self._skip += 1
+            return
+        if tag == "br":
+            self._emit("\n")
+            return
+        if tag in self.VOID_TAGS:
+            return
+
+        if tag in self.BLOCK_TAGS:
+            self._newline()
+        if tag == "pre":
+            self._pre += 1
+        elif tag == "tr":
+            self._cells = 0
+        elif tag in ("td", "th"):
+            # keep cells apart the way the plain-text clipboard does
+            if self._cells:
+                self._emit(" " * PASTE_TAB_SPACES)
+            self._cells += 1
+
+        self._open.append(tag)
+        self._styles.append(self._style_for(tag, attrs))
+
+        if tag == "li":
+            self._emit("• ")
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS:
+            self._skip = max(0, self._skip - 1)
+            return
+        if tag not in self._open:
+            return
+        # close anything left unclosed inside this element too
+        while self._open:
+            closed = self._open.pop()
+            self._styles.pop()
+            if closed == "pre":
+                self._pre = max(0, self._pre - 1)
+            if closed == tag:
+                break
+        if tag in self.BLOCK_TAGS:
+            self._newline()
+
+    def handle_data(self, data):
+        if self._skip:
+            return
+        if not self._pre:
+            data = re.sub(r"\s+", " ", data)
+            if self._last_char in ("\n", " "):
+                data = data.lstrip(" ")
+        self._emit(normalize_paste_text(data))
+
+    def take_runs(self, final=False):
+        # Trailing newlines are held back until more text follows and dropped at
+        # the end, so a paste doesn't finish with the break closing its last block.
+        runs, self.runs = self.runs, []
+        held = ""
+        while runs and runs[-1][0].endswith("\n"):
+            text, style = runs.pop()
+            stripped = text.rstrip("\n")
+            held = text[len(stripped):] + held
+            if stripped:
+                runs.append([stripped, style])
+                break
+        if held and not final:
+            self.runs.append([held, style])
+        return [(text, style) for text, style in runs]
+
+
+class LibraryIndex:
+    """
+    On-disk full-text index (SQLite FTS5) of the WordLite documents in a folder.
+    Each non-empty line is one row, so a hit maps straight to a Text index.
+    Files are only re-read when their mtime or size changed since the last sync.
+    """
+
+    def __init__(self, folder):
+        self.folder = os.path.abspath(folder)
+        self.path = os.path.join(self.folder, LIBRARY_INDEX_NAME)
+
+    def connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS files (
+                id INTEGER PRIMARY KEY,
+                path TEXT UNIQUE NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS lines USING fts5(
+                body, tokenize = 'unicode61 remove_diacritics 2'
+            );
+            """
+        )
+        return conn
+
+    def contains(self, path) -> bool:
+        path = os.path.abspath(path)
+        try:
+            inside = os.path.commonpath([self.folder, path]) == self.folder
+        except ValueError:
+            # different drives on Windows
+            return False
+        return inside and path.endswith(DOC_SUFFIX)
+
+    def scan(self):
+        found = {}
+        for root, dirs, files in os.walk(self.folder):
+            dirs[:] = [d for d in dirs if not d.startswith(".")]
+            for name in files:
+                if not name.endswith(DOC_SUFFIX):
+                    continue
+                full = os.path.join(root, name)
+                try:
+                    st = os.stat(full)
+                except OSError:
+                    continue
+                found[os.path.relpath(full, self.folder)] = (st.st_mtime_ns, st.st_size)
+        return found
+
+    def _read_lines(self, rel):
+        with open(os.path.join(self.folder, rel), "r", encoding="utf-8") as f:
+            text = json.load(f).get("text", "")
+        max_line = (1 << LIBRARY_LINE_BITS) - 1
+        for ln, line in enumerate(text.split("\n")[:max_line], start=1):
+            if line.strip() and line != PAGE_BREAK_TOKEN:
+                yield ln, line
+
+    def sync(self, conn, progress=None):
+        on_disk = self.scan()
+        known = {path: (fid, (mtime, size)) for fid, path, mtime, size in
+                 conn.execute("SELECT id, path, mtime_ns, size FROM files")}
+
+        removed = [known[p][0] for p in known if p not in on_disk]
+        changed = sorted(p for p, stat in on_disk.items() if p not in known or known[p][1] != stat)
+
+        with conn:
+            for fid in removed:
+                self._drop_rows(conn, fid)
+                conn.execute("DELETE FROM files WHERE id = ?", (fid,))
+
+        for i, rel in enumerate(changed, start=1):
+            mtime, size = on_disk[rel]
+            try:
+                rows = list(self._read_lines(rel))
+            except (OSError, ValueError, AttributeError):
+                # unreadable or not a WordLite doc: remember it so it is skipped until it changes
+                rows = []
+
+            with conn:
+                if rel in known:
+                    fid = known[rel][0]
+                    self._drop_rows(conn, fid)
+                    conn.execute("UPDATE files SET mtime_ns = ?, size = ? WHERE id = ?", (mtime, size, fid))
+                else:
+                    fid = conn.execute(
+                        "INSERT INTO files (path, mtime_ns, size) VALUES (?, ?, ?)", (rel, mtime, size)
+                    ).lastrowid
+                conn.executemany(
+                    "INSERT INTO lines (rowid, body) VALUES (?, ?)",
+                    (((fid << LIBRARY_LINE_BITS) | ln, line) for ln, line in rows),
+                )
+
+            if progress:
+                progress(i, len(changed))
+
+        return len(changed), len(removed)
+
+    def _drop_rows(self, conn, fid):
+        lo = fid << LIBRARY_LINE_BITS
+        conn.execute("DELETE FROM lines WHERE rowid BETWEEN ? AND ?", (lo, lo + (1 << LIBRARY_LINE_BITS) - 1))
+
+    @staticmethod
+    def match_expression(query: str) -> str:
+        # every word must appear, each as a prefix ("chap" finds "chapter")
+        return " ".join(f'"{word}"*' for word in re.findall(r"\w+", query))
+
+    def search(self, conn, query, limit=LIBRARY_MAX_HITS):
+        match = self.match_expression(query)
+        if not match:
+            return []
+        paths = dict(conn.execute("SELECT id, path FROM files"))
+        mask = (1 << LIBRARY_LINE_BITS) - 1
+        hits = []
+        for rowid, snippet in conn.execute(
+            "SELECT rowid, snippet(lines, 0, '[', ']', '…', 12) FROM lines "
+            "WHERE lines MATCH ? ORDER BY rank LIMIT ?",
+            (match, limit),
+        ):
+            path = paths.get(rowid >> LIBRARY_LINE_BITS)
+            if path is not None:
+                hits.append((path, rowid & mask, snippet))
+        return hits
+
+
 class WordLite(tk.Tk):
     def __init__(self):
         super().__init__()
@@ -42,6 +352,28 @@ class WordLite(tk.Tk):
         self._tb_relayout_job = None
         self._tb_last_width = None
 
+        # chunked paste state (_paste_pending is None when no paste is running)
+        self._paste_pending = None
+        self._paste_pending_chars = 0
+        self._paste_parser = None
+        self._paste_html = ""
+        self._paste_html_pos = 0
+        self._paste_fallback = None
+        self._paste_inserted = 0
+        self._paste_tags = {}
+        self._paste_user_edit = False
+        self._paste_job = None
+        self._paste_autoseparators = True
+
+        # library search state (window + worker thread)
+        self._library_index = None
+        self._library_conn = None
+        self._library_win = None
+        self._library_thread = None
+        self._library_again = False
+        self._library_queue = queue.Queue()
+        self._library_search_job = None
+
         self._build_ui()
         self._apply_default_style()
 
@@ -111,6 +443,7 @@ class WordLite(tk.Tk):
         self._toolbar_add(ttk.Button(self._tb_inner, text="Open", command=self.open_doc))
         self._toolbar_add(ttk.Button(self._tb_inner, text="Save", command=self.save_doc))
         self._toolbar_add(ttk.Button(self._tb_inner, text="Save As", command=self.save_as_doc))
+        self._toolbar_add(ttk.Button(self._tb_inner, text="Library", command=self.open_library))
         v_sep()
 
         # ---- Export ----
@@ -211,9 +544,19 @@ class WordLite(tk.Tk):
         # Shortcuts
         self.bind_all("<Control-s>", lambda e: self.save_doc())
         self.bind_all("<Control-o>", lambda e: self.open_doc())
+        self.bind_all("<Control-F>", lambda e: self.open_library())
         self.bind_all("<Control-b>", lambda e: self.toggle_bold())
         self.bind_all("<Control-i>", lambda e: self.toggle_italic())
         self.bind_all("<Control-u>", lambda e: self.toggle_underline())
+        self.text.bind("<<Paste>>", lambda e: self.paste_clipboard())
+        self.text.bind("<Control-V>", lambda e: self.paste_clipboard(rich=False))
+        # edits during a chunked paste get their own undo step (see _paste_guard);
+        # undo/redo complete the paste first so they never see half of it
+        self.text.bind("<KeyPress>", self._paste_key)
+        for seq in ("<<Cut>>", "<<Clear>>", "<<PasteSelection>>"):
+            self.text.bind(seq, lambda e: self._paste_guard())
+        for seq in ("<<Undo>>", "<<Redo>>"):
+            self.text.bind(seq, lambda e: self._finish_paste())
 
     def _apply_default_style(self):
         base = tkfont.Font(family=DEFAULT_FONT, size=DEFAULT_SIZE)
@@ -279,10 +622,6 @@ class WordLite(tk.Tk):
         elif toggle == "underline":
             underline = not underline
 
-        weight = "bold" if bold else "normal"
-        slant = "italic" if italic else "roman"
-        underline_flag = 1 if underline else 0
-
         # Remove existing font/style tags across range
         for t in list(self.text.tag_names()):
             if t.startswith("font_"):
@@ -292,8 +631,7 @@ class WordLite(tk.Tk):
         self.text.tag_remove("style_italic", start, end)
         self.text.tag_remove("style_underline", start, end)
 
-        tag = f"font_{family}_{size}_{weight}_{slant}_{underline_flag}".replace(" ", "_")
-        self.text.tag_configure(tag, font=(family, size, weight, slant), underline=underline_flag)
+        tag = self._font_tag(family, size, bold, italic, underline)
         self.text.tag_add(tag, start, end)
 
         # Re-add markers for detection
@@ -304,6 +642,14 @@ class WordLite(tk.Tk):
         if underline:
             self.text.tag_add("style_underline", start, end)
 
+    def _font_tag(self, family, size, bold, italic, underline):
+        weight = "bold" if bold else "normal"
+        slant = "italic" if italic else "roman"
+        underline_flag = 1 if underline else 0
+        tag = f"font_{family}_{size}_{weight}_{slant}_{underline_flag}".replace(" ", "_")
+        self.text.tag_configure(tag, font=(family, size, weight, slant), underline=underline_flag)
+        return tag
+
     def apply_font_to_selection(self):
         sel = self.selection()
         if not sel:
@@ -353,10 +699,13 @@ class WordLite(tk.Tk):
         hex_color = chosen[1]
         self._set_swatch(hex_color)
 
+        start, end = sel
+        self.text.tag_add(self._color_tag(hex_color), start, end)
+
+    def _color_tag(self, hex_color: str) -> str:
         tag = f"color_{hex_color.replace('#', '')}"
         self.text.tag_configure(tag, foreground=hex_color)
-        start, end = sel
-        self.text.tag_add(tag, start, end)
+        return tag
 
     # ---------------- Alignment ----------------
     def apply_alignment(self, which: str):
@@ -369,6 +718,7 @@ class WordLite(tk.Tk):
 
     # ---------------- Bullets ----------------
     def toggle_bullets(self):
+        self._paste_guard()
         start, end = self._selected_line_range()
 
         start_line = int(start.split(".")[0])
@@ -442,9 +792,234 @@ class WordLite(tk.Tk):
 
     # ---------------- Page breaks ----------------
     def insert_page_break(self):
+        self._paste_guard()
         idx = self.text.index("insert")
         self.text.insert(idx, "\n" + PAGE_BREAK_TOKEN + "\n")
 
+    # ---------------- Paste (chunked, rich) ----------------
+    def _clipboard_html(self):
+        # X11 clipboard owners offer "text/html"; elsewhere Tk only exposes plain text
+        try:
+            raw = self.clipboard_get(type="text/html")
+        except tk.TclError:
+            return None
+        return raw if raw.strip() else None
+
+    def _tags_for_style(self, style):
+        # one tag tuple per style combination per paste; runs repeat the same few styles
+        key = (style["bold"], style["italic"], style["underline"], style["color"], style["heading"])
+        tags = self._paste_tags.get(key)
+        if tags is not None:
+            return tags
+
+        tags = []
+        if style["bold"] or style["italic"] or style["underline"]:
+            family = self.font_var.get()
+            size = int(self.size_var.get())
+            tags.append(self._font_tag(family, size, style["bold"], style["italic"], style["underline"]))
+            for flag in ("bold", "italic", "underline"):
+                if style[flag]:
+                    tags.append(f"style_{flag}")
+        if style["color"]:
+            tags.append(self._color_tag(style["color"]))
+        if style["heading"]:
+            tags.append(style["heading"])
+        tags = tuple(tags)
+        self._paste_tags[key] = tags
+        return tags
+
+    def paste_clipboard(self, rich=True):
+        try:
+            plain = normalize_paste_text(self.clipboard_get())
+        except tk.TclError:
+            plain = None
+
+        raw = self._clipboard_html() if rich else None
+        if raw is None and not plain:
+            return "break"
+
+        self._start_paste()
+        if raw is not None:
+            # parsed slice by slice in _paste_step; plain text is the fallback
+            # if the HTML turns out to hold no text at all
+            self._paste_parser = ClipboardHTMLParser()
+            self._paste_html = raw
+            self._paste_fallback = plain
+        else:
+            self._queue_paste_run(plain, None)
+        self._paste_step()
+        return "break"
+
+    def paste_runs(self, runs):
+        """
+        Inserts (text, tags) runs at the cursor, PASTE_CHUNK_CHARS at a time.
+        tags=None lets the text inherit surrounding tags like a normal insert.
+        The whole paste (including replacing the selection) is one undo step,
+        unless the user edits while it runs (see _paste_guard).
+        """
+        self._start_paste()
+        for text, tags in runs:
+            self._queue_paste_run(text, tags)
+        self._paste_step()
+
+    def _start_paste(self):
+        self._finish_paste()
+
+        self._paste_autoseparators = self.text.cget("autoseparators")
+        self.text.configure(autoseparators=False)
+        self.text.edit_separator()
+
+        sel = self.selection()
+        if sel:
+            self.text.delete(*sel)
+
+        # Left gravity: whatever the user types at the paste point while chunks are
+        # still pending goes after this mark, so it ends up after the pasted text
+        # instead of being split by it. _insert_pasted moves the mark along.
+        self.text.mark_set("paste_end", "insert")
+        self.text.mark_gravity("paste_end", "left")
+        self._paste_pending = deque()
+        self._paste_pending_chars = 0
+        self._paste_inserted = 0
+        self._paste_tags = {}
+        self._paste_user_edit = False
+
+    def _queue_paste_run(self, text, tags):
+        if text:
+            self._paste_pending.append((text, tags))
+            self._paste_pending_chars += len(text)
+
+    def _parse_paste_slice(self, final=False):
+        parser = self._paste_parser
+        try:
+            if final:
+                parser.feed(self._paste_html[self._paste_html_pos:])
+                self._paste_html_pos = len(self._paste_html)
+            else:
+                end = self._paste_html_pos + PASTE_HTML_SLICE
+                parser.feed(self._paste_html[self._paste_html_pos:end])
+                self._paste_html_pos = end
+            done = self._paste_html_pos >= len(self._paste_html)
+            if done:
+                parser.close()
+        except Exception:
+            # malformed beyond what HTMLParser tolerates: keep what was parsed
+            done = True
+
+        for text, style in parser.take_runs(final=done):
+            self._queue_paste_run(text, self._tags_for_style(style) or None)
+
+        if done:
+            self._paste_parser = None
+            self._paste_html = ""
+            self._paste_html_pos = 0
+            if not self._paste_inserted and not self._paste_pending and self._paste_fallback:
+                self._queue_paste_run(self._paste_fallback, None)
+            self._paste_fallback = None
+
+    def _insert_pasted(self, pieces):
+        """Inserts [(text, tags)] at paste_end with as few Text.insert calls as possible."""
+        self.text.mark_gravity("paste_end", "right")
+        batch = []
+        for text, tags in pieces:
+            if tags is None:
+                if batch:
+                    self.text.insert("paste_end", *batch)
+                    batch = []
+                self.text.insert("paste_end", text)
+            else:
+                batch += [text, tags]
+        if batch:
+            self.text.insert("paste_end", *batch)
+        self.text.mark_gravity("paste_end", "left")
+
+    def _paste_step(self):
+        self._paste_job = None
+
+        if self._paste_user_edit:
+            # close the user's edit off from the rest of the paste
+            self.text.edit_separator()
+            self._paste_user_edit = False
+
+        if self._paste_parser is not None and self._paste_pending_chars < PASTE_CHUNK_CHARS:
+            self._parse_paste_slice()
+
+        budget = PASTE_CHUNK_CHARS
+        pieces = []
+        while self._paste_pending and budget > 0:
+            text, tags = self._paste_pending[0]
+            if len(text) > budget:
+                # prefer cutting at a line boundary
+                cut = text.rfind("\n", 0, budget) + 1 or budget
+                piece = text[:cut]
+                self._paste_pending[0] = (text[cut:], tags)
+            else:
+                piece = text
+                self._paste_pending.popleft()
+            pieces.append((piece, tags))
+            budget -= len(piece)
+
+        inserted = PASTE_CHUNK_CHARS - budget
+        self._paste_pending_chars -= inserted
+        self._paste_inserted += inserted
+        self._insert_pasted(pieces)
+
+        if self._paste_pending or self._paste_parser is not None:
+            self._paste_job = self.after(PASTE_CHUNK_DELAY_MS, self._paste_step)
+            return
+
+        self._end_paste()
+        self.text.see("insert")
+
+    def _end_paste(self):
+        if self._paste_job is not None:
+            try:
+                self.after_cancel(self._paste_job)
+            except Exception:
+                pass
+            self._paste_job = None
+        self._paste_pending = None
+        self._paste_pending_chars = 0
+        self._paste_parser = None
+        self._paste_html = ""
+        self._paste_html_pos = 0
+        self._paste_fallback = None
+        self._paste_tags = {}
+        self.text.edit_separator()
+        self.text.configure(autoseparators=self._paste_autoseparators)
+        self.text.mark_unset("paste_end")
+
+    def _finish_paste(self):
+        # insert whatever is still queued right now (before save, export, undo or another paste)
+        if self._paste_pending is None:
+            return
+        if self._paste_job is not None:
+            try:
+                self.after_cancel(self._paste_job)
+            except Exception:
+                pass
+            self._paste_job = None
+        if self._paste_parser is not None:
+            self._parse_paste_slice(final=True)
+        self._insert_pasted(self._paste_pending)
+        self._end_paste()
+
+    def _paste_key(self, event):
+        # navigation keys have no char and don't touch the text
+        if event.char or event.keysym in ("BackSpace", "Delete"):
+            self._paste_guard()
+
+    def _paste_guard(self):
+        # Call before any edit made while a paste is running: the edit gets its own
+        # undo step instead of joining the paste's (the paste is split around it).
+        if self._paste_pending is not None:
+            self.text.edit_separator()
+            self._paste_user_edit = True
+
+    def _cancel_paste(self):
+        if self._paste_pending is not None:
+            self._end_paste()
+
     # ---------------- Comments ----------------
     def add_comment(self):
         sel = self.selection()
@@ -504,10 +1079,197 @@ class WordLite(tk.Tk):
             c.text = new
             self.refresh_comments()
 
+    # ---------------- Library (indexed search across a folder) ----------------
+    def open_library(self):
+        if self._library_win is not None and self._library_win.winfo_exists():
+            self._library_win.deiconify()
+            self._library_win.lift()
+            self._library_entry.focus_set()
+            return
+
+        if self._library_index is None and not self.choose_library_folder():
+            return
+
+        win = tk.Toplevel(self)
+        win.title("Library")
+        win.geometry("760x480")
+        win.protocol("WM_DELETE_WINDOW", self._close_library)
+        self._library_win = win
+
+        top = ttk.Frame(win, padding=(10, 8))
+        top.pack(fill=tk.X)
+        self._library_folder_label = ttk.Label(top, text=self._library_index.folder)
+        self._library_folder_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        ttk.Button(top, text="Folder…", command=self.choose_library_folder).pack(side=tk.LEFT, padx=4)
+        ttk.Button(top, text="Rescan", command=self._library_reindex).pack(side=tk.LEFT)
+
+        self._library_query = tk.StringVar()
+        self._library_entry = ttk.Entry(win, textvariable=self._library_query)
+        self._library_entry.pack(fill=tk.X, padx=10)
+        self._library_entry.bind("<KeyRelease>", lambda e: self._schedule_library_search())
+        self._library_entry.bind("<Return>", lambda e: self._library_search())
+
+        cols = ("file", "line", "snippet")
+        self._library_hits = ttk.Treeview(win, columns=cols, show="headings")
+        self._library_hits.heading("file", text="File")
+        self._library_hits.heading("line", text="Line")
+        self._library_hits.heading("snippet", text="Match")
+        self._library_hits.column("file", width=200, stretch=False)
+        self._library_hits.column("line", width=50, stretch=False, anchor="e")
+        self._library_hits.column("snippet", width=480)
+        self._library_hits.pack(fill=tk.BOTH, expand=True, padx=10, pady=8)
+        self._library_hits.bind("<Double-1>", lambda e: self._open_library_hit())
+        self._library_hits.bind("<Return>", lambda e: self._open_library_hit())
+
+        self._library_status = ttk.Label(win, text="", padding=(10, 0, 10, 8))
+        self._library_status.pack(fill=tk.X)
+
+        self._library_entry.focus_set()
+        self._library_reindex()
+
+    def choose_library_folder(self) -> bool:
+        folder = filedialog.askdirectory(title="Choose the folder with your documents")
+        if not folder:
+            return False
+
+        if self._library_conn is not None:
+            self._library_conn.close()
+            self._library_conn = None
+
+        index = LibraryIndex(folder)
+        try:
+            self._library_conn = index.connect()
+        except sqlite3.Error as e:
+            messagebox.showerror("Library", f"Could not open the index:\n{e}")
+            return False
+        self._library_index = index
+
+        if self._library_win is not None and self._library_win.winfo_exists():
+            self._library_folder_label.configure(text=index.folder)
+            self._library_hits.delete(*self._library_hits.get_children())
+            self._library_reindex()
+        return True
+
+    def _close_library(self):
+        if self._library_search_job is not None:
+            self.after_cancel(self._library_search_job)
+            self._library_search_job = None
+        self._library_win.destroy()
+        self._library_win = None
+
+    def _set_library_status(self, text):
+        if self._library_win is not None and self._library_win.winfo_exists():
+            self._library_status.configure(text=text)
+
+    def _library_reindex(self):
+        if self._library_thread is not None and self._library_thread.is_alive():
+            self._library_again = True
+            return
+
+        index = self._library_index
+        q = self._library_queue
+
+        def work():
+            # the worker gets its own connection; sqlite connections stay on one thread
+            try:
+                conn = index.connect()
+                try:
+                    changed, removed = index.sync(conn, progress=lambda done, total: q.put((index, "progress", done, total)))
+                finally:
+                    conn.close()
+                q.put((index, "done", changed, removed))
+            except Exception as e:
+                q.put((index, "error", str(e), None))
+
+        self._library_again = False
+        self._library_thread = threading.Thread(target=work, daemon=True)
+        self._library_thread.start()
+        self._set_library_status("Indexing…")
+        self.after(100, self._poll_library)
+
+    def _poll_library(self):
+        # check before draining so a final "done" posted meanwhile is not missed
+        alive = self._library_thread.is_alive()
+        while True:
+            try:
+                index, kind, a, b = self._library_queue.get_nowait()
+            except queue.Empty:
+                break
+            if index is not self._library_index:
+                continue
+            if kind == "progress":
+                self._set_library_status(f"Indexing… {a}/{b}")
+            elif kind == "done":
+                self._set_library_status(f"Index up to date ({a} updated, {b} removed)")
+                self._library_search()
+            else:
+                self._set_library_status(f"Indexing failed: {a}")
+
+        if alive:
+            self.after(100, self._poll_library)
+        elif self._library_again:
+            self._library_reindex()
+
+    def _schedule_library_search(self):
+        if self._library_search_job is not None:
+            try:
+                self.after_cancel(self._library_search_job)
+            except Exception:
+                pass
+        self._library_search_job = self.after(200, self._library_search)
+
+    def _library_search(self):
+        self._library_search_job = None
+        if self._library_win is None or not self._library_win.winfo_exists():
+            return
+
+        tree = self._library_hits
+        tree.delete(*tree.get_children())
+        query = self._library_query.get()
+        try:
+            hits = self._library_index.search(self._library_conn, query)
+        except sqlite3.Error as e:
+            self._set_library_status(f"Search failed: {e}")
+            return
+
+        for path, line, snippet in hits:
+            tree.insert("", tk.END, values=(path, line, snippet.replace("\n", " ")))
+        if query.strip():
+            self._set_library_status(f"{len(hits)} match{'es' if len(hits) != 1 else ''}")
+
+    def _open_library_hit(self):
+        sel = self._library_hits.selection()
+        if not sel:
+            return
+        rel, line, _ = self._library_hits.item(sel[0], "values")
+        line = int(line)
+
+        if not messagebox.askyesno("Open", "Discard current document and open another?", parent=self._library_win):
+            return
+        if not self._load_file(os.path.join(self._library_index.folder, rel)):
+            return
+
+        # put the cursor on the first matching word of that line
+        start = f"{line}.0"
+        end = start
+        for word in re.findall(r"\w+", self._library_query.get()):
+            found = self.text.search(rf"\m{word}", start, f"{line}.0 lineend", nocase=True, regexp=True)
+            if found:
+                start, end = found, self.text.index(f"{found} wordend")
+                break
+
+        self.text.tag_remove("sel", "1.0", "end")
+        self.text.tag_add("sel", start, end)
+        self.text.mark_set("insert", start)
+        self.text.see(start)
+        self.lift()
+        self.text.focus_set()
+
     # ---------------- Save/Open with formatting tags ----------------
     def new_doc(self):
         if not messagebox.askyesno("New", "Discard current document and start a new one?"):
             return
+        self._cancel_paste()
         self.text.delete("1.0", tk.END)
         self.comments.clear()
         self.refresh_comments()
@@ -583,6 +1345,7 @@ class WordLite(tk.Tk):
             self.text.tag_add(tag, start, end)
 
     def _write_file(self, path):
+        self._finish_paste()
         data = {
             "version": 6,
             "text": self.text.get("1.0", "end-1c"),
@@ -595,6 +1358,10 @@ class WordLite(tk.Tk):
             messagebox.showinfo("Saved", f"Saved to:\n{path}")
         except Exception as e:
             messagebox.showerror("Save Failed", str(e))
+            return
+
+        if self._library_index is not None and self._library_index.contains(path):
+            self._library_reindex()
 
     def open_doc(self):
         path = filedialog.askopenfilename(
@@ -606,10 +1373,14 @@ class WordLite(tk.Tk):
         if not messagebox.askyesno("Open", "Discard current document and open another?"):
             return
 
+        self._load_file(path)
+
+    def _load_file(self, path) -> bool:
         try:
             with open(path, "r", encoding="utf-8") as f:
                 data = json.load(f)
 
+            self._cancel_paste()
             self.text.delete("1.0", tk.END)
             self.text.insert("1.0", data.get("text", ""))
 
@@ -627,9 +1398,11 @@ class WordLite(tk.Tk):
 
             self.current_file = path
             self.title(f"{APP_TITLE} — {os.path.basename(path)}")
+            return True
 
         except Exception as e:
             messagebox.showerror("Open Failed", str(e))
+            return False
 
     # ---------------- Export PDF (via browser print) ----------------
     def export_pdf(self):
@@ -640,6 +1413,7 @@ class WordLite(tk.Tk):
         if not html_path:
             return
 
+        self._finish_paste()
         raw = self.text.get("1.0", "end-1c")
         parts = raw.split(PAGE_BREAK_TOKEN)
 